@@ -0,0 +1,50 @@
+﻿// Licensed to ifak e.V. under one or more agreements.
+// ifak e.V. licenses this file to you under the MIT license.
+// See the LICENSE file in the project root for more information.
+
+using System;
+using Python.Runtime;
+using VTQs = System.Collections.Generic.List<Ifak.Fast.Mediator.VTQ>;
+
+namespace Ifak.Fast.Mediator.Calc.Adapter_Python;
+
+/// <summary>
+/// Columnar result of HistorianReadAggregatedRange. Python allocates the target arrays
+/// (see FastISO.py) and lets this object copy interval starts and values into them.
+/// </summary>
+public sealed class PyAggregatedIntervals
+{
+    private readonly long[] intervalStarts; // JavaTicks
+    private readonly double[][] values;     // per aggregation, NaN = no value
+
+    internal PyAggregatedIntervals(Timestamp[] bounds, VTQs[] results) {
+
+        int n = bounds.Length - 1;
+
+        intervalStarts = new long[n];
+        for (int i = 0; i < n; ++i) {
+            intervalStarts[i] = bounds[i].JavaTicks;
+        }
+
+        values = new double[results.Length][];
+        for (int a = 0; a < results.Length; ++a) {
+            VTQs vtqs = results[a];
+            if (vtqs.Count != n) {
+                throw new Exception($"Expected {n} aggregated values but got {vtqs.Count}");
+            }
+            var v = new double[n];
+            for (int i = 0; i < n; ++i) {
+                v[i] = vtqs[i].V.AsDouble() ?? double.NaN;
+            }
+            values[a] = v;
+        }
+    }
+
+    public int Count => intervalStarts.Length;
+
+    public int AggregationCount => values.Length;
+
+    public void CopyIntervalStartsTo(PyObject buffer) => BufferUtil.WriteInt64(intervalStarts, buffer);
+
+    public void CopyValuesTo(int aggregationIndex, PyObject buffer) => BufferUtil.WriteFloat64(values[aggregationIndex], buffer);
+}
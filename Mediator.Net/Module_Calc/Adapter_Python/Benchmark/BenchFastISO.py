@@ -0,0 +1,441 @@
+"""Benchmarks for the conversion hot paths of FastISO.py.
+
+Runs with plain CPython (no pythonnet, no Mediator assemblies) against the stand-ins in
+StubHost.py, so the figures cover the Python side of each conversion only.
+
+Usage:
+    python BenchFastISO.py [--scale 1.0] [--filter text] [--json out.json] [--compare baseline.json]
+
+Save the results of one version with --json and pass that file to --compare when running
+another version to print the ratio of time per operation (new / baseline).
+"""
+
+import argparse
+import atexit
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import StubHost
+
+FastISO = StubHost.LoadFastISO()
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class Case:
+
+    def __init__(self, name: str, size: int, setup: Callable[[int], Callable[[], object]], requiresNumpy: bool) -> None:
+        self.Name = name
+        self.Size = size
+        self.Setup = setup
+        self.RequiresNumpy = requiresNumpy
+
+
+CASES: list[Case] = []
+
+
+def case(name: str, size: int, requiresNumpy: bool = False):
+    def register(setup):
+        CASES.append(Case(name, size, setup, requiresNumpy))
+        return setup
+    return register
+
+
+T0 = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _times(n: int) -> list[datetime]:
+    return [T0 + timedelta(minutes=15 * i) for i in range(n)]
+
+
+def _entries(n: int) -> list:
+    return [FastISO.TimeseriesEntry(t, float(i)) for i, t in enumerate(_times(n))]
+
+
+def _objects(n: int) -> list[dict]:
+    return [{"id": i, "name": f"obj{i}", "value": i * 0.5, "active": i % 2 == 0} for i in range(n)]
+
+
+def _setInput(inp, jsonValue: str):
+    inp.VTQ = StubHost.VTQ(StubHost.DataValue.FromJSON(jsonValue), StubHost.Timestamp(1_700_000_000_000), StubHost.Quality.Good)
+    return inp
+
+
+def _bounds(n: int) -> list:
+    return [StubHost.Timestamp(1_700_000_000_000 + i * 900_000) for i in range(n + 1)]
+
+
+########### Inputs #############
+
+@case("InputFloat64.Value", 1)
+def _(n):
+    inp = _setInput(FastISO.InputFloat64("x"), "3.25")
+    return lambda: inp.Value
+
+@case("InputFloat64Array.Value", 10_000)
+def _(n):
+    inp = _setInput(FastISO.InputFloat64Array("x", None), json.dumps([i * 0.5 for i in range(n)]))
+    return lambda: inp.Value
+
+@case("InputString.Value", 1)
+def _(n):
+    inp = _setInput(FastISO.InputString("x", None), json.dumps("some text"))
+    return lambda: inp.Value
+
+@case("InputJson.Value", 1)
+def _(n):
+    inp = _setInput(FastISO.InputJson("x", "null"), json.dumps(_objects(10)))
+    return lambda: inp.Value
+
+@case("InputTimestamp.Value", 1)
+def _(n):
+    inp = _setInput(FastISO.InputTimestamp("x", None), json.dumps("2024-01-01T12:00:00.000Z"))
+    return lambda: inp.Value
+
+@case("InputObject.Value", 100)
+def _(n):
+    inp = _setInput(FastISO.InputObject("x", None), json.dumps({f"key{i}": i for i in range(n)}))
+    return lambda: inp.Value
+
+@case("InputObjectArray.Value", 1_000)
+def _(n):
+    inp = _setInput(FastISO.InputObjectArray("x", None), json.dumps(_objects(n)))
+    return lambda: inp.Value
+
+@case("InputTimeseries.Value", 10_000)
+def _(n):
+    inp = _setInput(FastISO.InputTimeseries("x"), json.dumps([e.to_dict() for e in _entries(n)]))
+    return lambda: inp.Value
+
+@case("MyInputBase.HistorianReadRaw", 10_000)
+def _(n):
+    inp = FastISO.InputFloat64("x")
+    inp.HistorySize = n
+    t = StubHost.Timestamp(0)
+    return lambda: inp.HistorianReadRaw(t, t, n, StubHost.BoundingMethod.TakeFirstN)
+
+@case("MyInputBase.HistorianReadAggregatedIntervals", 35_040)
+def _(n):
+    inp = FastISO.InputFloat64("x")
+    bounds = _bounds(n)
+    return lambda: inp.HistorianReadAggregatedIntervals(bounds, StubHost.Aggregation.Average)
+
+@case("MyInputBase.HistorianReadAggregatedRange(3 aggregations)", 35_040, requiresNumpy=True)
+def _(n):
+    inp = FastISO.InputFloat64("x")
+    start = StubHost.Timestamp(1_700_000_000_000)
+    end = start.AddMillis(n * 900_000)
+    aggregations = [StubHost.Aggregation.Average, StubHost.Aggregation.Min, StubHost.Aggregation.Max]
+    return lambda: inp.HistorianReadAggregatedRange(start, end, timedelta(minutes=15), aggregations)
+
+########### States #############
+
+def _stateRoundTrip(state, value):
+    def run():
+        state.Value = value
+        return state.Value
+    return run
+
+@case("StateFloat64.Value set+get", 1)
+def _(n):
+    return _stateRoundTrip(FastISO.StateFloat64("s"), 3.25)
+
+@case("StateFloat64Array.Value set+get", 10_000)
+def _(n):
+    return _stateRoundTrip(FastISO.StateFloat64Array("s", None), [i * 0.5 for i in range(n)])
+
+@case("StateString.Value set+get", 1)
+def _(n):
+    return _stateRoundTrip(FastISO.StateString("s", None), "some text")
+
+@case("StateTimestamp.Value set+get", 1)
+def _(n):
+    return _stateRoundTrip(FastISO.StateTimestamp("s", None), T0)
+
+@case("StateObject.Value set+get", 100)
+def _(n):
+    return _stateRoundTrip(FastISO.StateObject("s", None), {f"key{i}": i for i in range(n)})
+
+@case("StateObjectArray.Value set+get", 1_000)
+def _(n):
+    return _stateRoundTrip(FastISO.StateObjectArray("s", None), _objects(n))
+
+########### Outputs #############
+
+def _outputSet(output, value):
+    def run():
+        output.Value = value
+    return run
+
+@case("OutputFloat64.Value", 1)
+def _(n):
+    return _outputSet(FastISO.OutputFloat64("o"), 3.123456789)
+
+@case("OutputInt32.Value", 1)
+def _(n):
+    return _outputSet(FastISO.OutputInt32("o"), 42)
+
+@case("OutputFloat64Array.Value", 10_000)
+def _(n):
+    return _outputSet(FastISO.OutputFloat64Array("o"), [i * 0.5 for i in range(n)])
+
+@case("OutputFloat64Array.SetValues(list)", 10_000)
+def _(n):
+    output = FastISO.OutputFloat64Array("o")
+    values = [i * 0.5 for i in range(n)]
+    return lambda: output.SetValues(values)
+
+@case("OutputFloat64Array.SetValues(ndarray)", 10_000, requiresNumpy=True)
+def _(n):
+    output = FastISO.OutputFloat64Array("o")
+    values = numpy.arange(n, dtype=numpy.float64)
+    return lambda: output.SetValues(values)
+
+@case("OutputString.Value", 1)
+def _(n):
+    return _outputSet(FastISO.OutputString("o"), "some text")
+
+@case("OutputTimestamp.Value", 1)
+def _(n):
+    return _outputSet(FastISO.OutputTimestamp("o"), T0)
+
+@case("OutputTimeseries.Value", 100_000)
+def _(n):
+    return _outputSet(FastISO.OutputTimeseries("o"), _entries(n))
+
+@case("OutputTimeseries.SetColumns(list)", 100_000)
+def _(n):
+    output = FastISO.OutputTimeseries("o")
+    times = _times(n)
+    values = [float(i) for i in range(n)]
+    return lambda: output.SetColumns(times, values)
+
+@case("OutputTimeseries.SetColumns(naive datetime list)", 100_000)
+def _(n):
+    aware = _times(n)
+    naive = [t.replace(tzinfo=None) for t in aware]
+    expected = [round(t.timestamp() * 1000) for t in aware]
+    # Naive datetimes must be treated as UTC, independent of the local time zone of the process:
+    for times in (aware, naive):
+        if list(FastISO._toJavaTicksBuffer("times", times)) != expected:
+            raise Exception("SetColumns: naive and aware datetimes result in different timestamps")
+    output = FastISO.OutputTimeseries("o")
+    values = [float(i) for i in range(n)]
+    return lambda: output.SetColumns(naive, values)
+
+@case("OutputTimeseries.AppendColumns(list, dropBefore)", 1_000)
+def _(n):
+    output = FastISO.OutputTimeseries("o")
+    times = _times(n)
+    values = [float(i) for i in range(n)]
+    output.SetColumns(times, values)
+    return lambda: output.AppendColumns(times, values, dropBefore=times[0])
+
+@case("OutputTimeseries.SetColumns(ndarray)", 100_000, requiresNumpy=True)
+def _(n):
+    output = FastISO.OutputTimeseries("o")
+    times = numpy.datetime64("2024-01-01T00:00") + numpy.arange(n) * numpy.timedelta64(15, "m")
+    values = numpy.arange(n, dtype=numpy.float64)
+    return lambda: output.SetColumns(times, values)
+
+@case("OutputObject.Value", 100)
+def _(n):
+    return _outputSet(FastISO.OutputObject("o"), {f"key{i}": i for i in range(n)})
+
+@case("OutputObjectArray.Value", 1_000)
+def _(n):
+    return _outputSet(FastISO.OutputObjectArray("o"), _objects(n))
+
+########### Helpers #############
+
+@case("TimeseriesEntry round-trip", 10_000)
+def _(n):
+    inp = FastISO.InputTimeseries("x")
+    entries = _entries(n)
+    def run():
+        _setInput(inp, json.dumps([e.to_dict() for e in entries]))
+        return inp.Value
+    return run
+
+@case("_convertDotNetListOfList", 20 * 10_000)
+def _(n):
+    lists = StubHost.List[StubHost.List]()
+    for _ in range(20):
+        lists.Add(StubHost.MakeHistory(n // 20))
+    return lambda: FastISO._convertDotNetListOfList(lists)
+
+@case("Api.ReadVariablesHistory", 20 * 1_000)
+def _(n):
+    api = FastISO.Api()
+    api.HistorySize = n // 20
+    variables = [StubHost.VariableRef(f"obj{i}") for i in range(20)]
+    t = StubHost.Timestamp(0)
+    return lambda: api.ReadVariablesHistory(variables, t, t)
+
+@case("Api.HistorianReadAggregatedIntervals", 35_040)
+def _(n):
+    api = FastISO.Api()
+    bounds = _bounds(n)
+    variable = StubHost.VariableRef("obj")
+    return lambda: api.HistorianReadAggregatedIntervals(variable, bounds, StubHost.Aggregation.Average)
+
+@case("Api.HistorianReadAggregatedRange(3 aggregations)", 35_040, requiresNumpy=True)
+def _(n):
+    api = FastISO.Api()
+    variable = StubHost.VariableRef("obj")
+    start = StubHost.Timestamp(1_700_000_000_000)
+    end = start.AddMillis(n * 900_000)
+    aggregations = [StubHost.Aggregation.Average, StubHost.Aggregation.Min, StubHost.Aggregation.Max]
+    return lambda: api.HistorianReadAggregatedRange(variable, start, end, "15 min", aggregations)
+
+@case("AggregationUtils.Aggregate", 20 * 10_000)
+def _(n):
+    histories = [[vtq for vtq in StubHost.MakeHistory(n // 20)] for _ in range(20)]
+    resolution = StubHost.Duration.FromMinutes(15)
+    return lambda: FastISO.AggregationUtils.Aggregate(histories, StubHost.Aggregation.Average, resolution, False)
+
+@case("AggregationUtils.ExportToMatrix", 20 * 10_000)
+def _(n):
+    histories = [[vtq for vtq in StubHost.MakeHistory(n // 20)] for _ in range(20)]
+    return lambda: FastISO.AggregationUtils.ExportToMatrix(histories)
+
+########### ProcessPool #############
+
+@case("ProcessPool.Map(8 ndarrays)", 8 * 100_000, requiresNumpy=True)
+def _(n):
+    import ParallelTasks
+    pool = FastISO.ProcessPool(2, sys.executable)
+    pool.Start()
+    atexit.register(pool.Shutdown)
+    items = [(i, numpy.arange(n // 8, dtype=numpy.float64) + i) for i in range(8)]
+
+    results = pool.Map(ParallelTasks.scaled, items)
+    if [index for index, _ in results] != list(range(8)):
+        raise Exception("ProcessPool.Map: results not in order of items")
+    if not all(numpy.array_equal(values, item[1] * 2.0) for (_, values), item in zip(results, items)):
+        raise Exception("ProcessPool.Map: array results differ from expected values")
+    try:
+        pool.Map(ParallelTasks.failOnNegative, [1.0, -1.0, 2.0])
+    except Exception as exp:
+        if "item 1 failed: ValueError" not in str(exp):
+            raise Exception(f"ProcessPool.Map: unexpected error message: {exp}")
+    else:
+        raise Exception("ProcessPool.Map: exception of worker not propagated")
+
+    return lambda: pool.Map(ParallelTasks.scaled, items)
+
+
+########### Runner #############
+
+def _timePerOp(fn: Callable[[], object], minSeconds: float, repeat: int) -> float:
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= minSeconds / 10 or number >= 1_000_000:
+            break
+        number *= 10
+    # Calibration ran for at least minSeconds / 10, scale each repetition to about minSeconds:
+    number = max(1, int(number * minSeconds / max(elapsed, 1e-9)))
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def _allocation(fn: Callable[[], object]) -> tuple[float, int]:
+    """Returns peak traced memory (KiB) of one call and the number of blocks it leaves allocated"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        blocksBefore = len(tracemalloc.take_snapshot().traces)
+        result = fn()
+        _, peak = tracemalloc.get_traced_memory()
+        result = None
+        gc.collect()
+        blocksAfter = len(tracemalloc.take_snapshot().traces)
+    finally:
+        tracemalloc.stop()
+    return (peak - before) / 1024.0, blocksAfter - blocksBefore
+
+
+def run(scale: float, filterText: Optional[str], minSeconds: float, repeat: int) -> dict:
+    results = {}
+    print(f"{'case':<56} {'items':>8} {'us/op':>12} {'items/s':>14} {'peak KiB':>10} {'kept blocks':>11}")
+    for c in CASES:
+        if filterText and filterText.lower() not in c.Name.lower():
+            continue
+        if c.RequiresNumpy and numpy is None:
+            print(f"{c.Name:<56} skipped (numpy not installed)")
+            continue
+        n = max(1, int(c.Size * scale)) if c.Size > 1 else 1
+        fn = c.Setup(n)
+        fn()  # warm up
+        seconds = _timePerOp(fn, minSeconds, repeat)
+        peakKiB, keptBlocks = _allocation(fn)
+        itemsPerSecond = n / seconds
+        print(f"{c.Name:<56} {n:>8} {seconds * 1e6:>12.2f} {itemsPerSecond:>14,.0f} {peakKiB:>10.1f} {keptBlocks:>11}")
+        results[c.Name] = {
+            "items": n,
+            "usPerOp": seconds * 1e6,
+            "itemsPerSecond": itemsPerSecond,
+            "peakKiB": peakKiB,
+            "keptBlocks": keptBlocks,
+        }
+    return results
+
+
+def compare(results: dict, baseline: dict) -> None:
+    print()
+    print(f"{'case':<56} {'baseline us':>12} {'us/op':>12} {'ratio':>7} {'peak ratio':>10}")
+    for name, r in results.items():
+        b = baseline.get(name)
+        if b is None or b["items"] != r["items"]:
+            continue
+        ratio = r["usPerOp"] / b["usPerOp"]
+        peakRatio = r["peakKiB"] / b["peakKiB"] if b["peakKiB"] > 0 else float("nan")
+        print(f"{name:<56} {b['usPerOp']:>12.2f} {r['usPerOp']:>12.2f} {ratio:>7.2f} {peakRatio:>10.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmarks for FastISO.py conversions")
+    parser.add_argument("--scale", type=float, default=1.0, help="factor applied to the item counts")
+    parser.add_argument("--filter", default=None, help="run only cases containing this text")
+    parser.add_argument("--min-seconds", type=float, default=0.5, help="approximate measuring time per case and repetition")
+    parser.add_argument("--repeat", type=int, default=3, help="repetitions, the best one is reported")
+    parser.add_argument("--json", default=None, help="write results to this file")
+    parser.add_argument("--compare", default=None, help="compare with results written by --json")
+    args = parser.parse_args()
+
+    print(f"Python {sys.version.split()[0]}, numpy {numpy.__version__ if numpy is not None else 'not installed'}")
+    results = run(args.scale, args.filter, args.min_seconds, args.repeat)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"python": sys.version, "results": results}, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        compare(results, baseline["results"])
+
+
+if __name__ == "__main__":
+    main()
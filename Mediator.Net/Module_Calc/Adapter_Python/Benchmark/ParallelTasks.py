@@ -0,0 +1,15 @@
+"""Functions executed by the worker processes in the ProcessPool benchmark case.
+They must live in an importable module, not in the benchmark script itself."""
+
+import numpy
+
+
+def scaled(item: tuple) -> tuple:
+    index, values = item
+    return index, values * 2.0
+
+
+def failOnNegative(value: float) -> float:
+    if value < 0:
+        raise ValueError(f"negative value {value}")
+    return value
@@ -0,0 +1,470 @@
+"""Pure-Python stand-in for the .NET types imported by FastISO.py.
+
+Install() registers fake 'Ifak.*' and 'System.*' modules in sys.modules so that FastISO.py
+can be imported without pythonnet and the Mediator assemblies. The stand-ins implement
+just enough behavior for FastISO.py (DataValue keeps the JSON string like the .NET type)
+and are deliberately cheap, so that benchmarks measure the Python side of the conversions.
+"""
+
+import array
+import enum
+import importlib.util
+import json
+import os
+import sys
+import types
+from datetime import datetime, timezone
+from typing import Optional
+
+
+class Timestamp:
+
+    __slots__ = ("JavaTicks",)
+
+    def __init__(self, javaTicks: int) -> None:
+        self.JavaTicks = javaTicks
+
+    @staticmethod
+    def FromJavaTicks(ticks: int) -> 'Timestamp':
+        return Timestamp(ticks)
+
+    @staticmethod
+    def FromISO8601(s: str) -> 'Timestamp':
+        dt = datetime.fromisoformat(s)
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return Timestamp(round(dt.timestamp() * 1000))
+
+    def AddMillis(self, millis: int) -> 'Timestamp':
+        return Timestamp(self.JavaTicks + millis)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Timestamp) and other.JavaTicks == self.JavaTicks
+
+    def __hash__(self) -> int:
+        return hash(self.JavaTicks)
+
+    def __str__(self) -> str:
+        dt = datetime.fromtimestamp(self.JavaTicks / 1000.0, timezone.utc)
+        return dt.strftime("%Y-%m-%dT%H:%M:%S.") + f"{self.JavaTicks % 1000:03d}Z"
+
+
+class Duration:
+
+    def __init__(self, millis: int) -> None:
+        self.TotalMilliseconds = millis
+
+    @staticmethod
+    def FromSeconds(seconds: float) -> 'Duration':
+        return Duration(round(seconds * 1000))
+
+    @staticmethod
+    def FromMinutes(minutes: float) -> 'Duration':
+        return Duration(round(minutes * 60000))
+
+
+class DataValue:
+
+    __slots__ = ("_json",)
+
+    def __init__(self, jsonOrNull: Optional[str]) -> None:
+        self._json = jsonOrNull
+
+    @property
+    def JSON(self) -> str:
+        return self._json if self._json is not None else "null"
+
+    @property
+    def IsEmpty(self) -> bool:
+        return self._json is None
+
+    @staticmethod
+    def FromJSON(s: Optional[str]) -> 'DataValue':
+        if s is None or s.strip() == "" or s == "null":
+            return DataValue(None)
+        return DataValue(s)
+
+    @staticmethod
+    def FromDouble(v: float) -> 'DataValue':
+        return DataValue(json.dumps(v))
+
+    @staticmethod
+    def FromInt(v: int) -> 'DataValue':
+        return DataValue(str(v))
+
+    @staticmethod
+    def FromString(v: Optional[str]) -> 'DataValue':
+        return DataValue.FromJSON(json.dumps(v))
+
+    @staticmethod
+    def FromTimestamp(v: Timestamp) -> 'DataValue':
+        return DataValue(json.dumps(str(v)))
+
+    @staticmethod
+    def FromDoubleArray(v) -> 'DataValue':
+        return DataValue(json.dumps(list(v)))
+
+    def AsDouble(self) -> Optional[float]:
+        if self._json is None:
+            return None
+        return float(json.loads(self._json))
+
+    def GetString(self) -> Optional[str]:
+        if self._json is None:
+            return None
+        return json.loads(self._json)
+
+    def GetTimestampOrNull(self) -> Optional[Timestamp]:
+        s = self.GetString()
+        return Timestamp.FromISO8601(s) if s is not None else None
+
+
+DataValue.Empty = DataValue(None)
+
+
+class Quality(enum.IntEnum):
+    Bad = 0
+    Good = 1
+    Uncertain = 2
+
+
+class QualityFilter(enum.IntEnum):
+    ExcludeNone = 0
+    ExcludeBad = 1
+    ExcludeNonGood = 2
+
+
+class Aggregation(enum.IntEnum):
+    Average = 0
+    Count = 1
+    Sum = 2
+    Min = 3
+    Max = 4
+    First = 5
+    Last = 6
+
+
+class BoundingMethod(enum.IntEnum):
+    TakeFirstN = 0
+    TakeLastN = 1
+    CompressToN = 2
+
+
+class DataType(enum.IntEnum):
+    Bool = 0
+    Byte = 1
+    Int32 = 6
+    Float64 = 10
+    String = 12
+    JSON = 13
+    Timestamp = 14
+    Struct = 17
+    Timeseries = 19
+
+
+class VTQ:
+
+    __slots__ = ("V", "T", "Q")
+
+    def __init__(self, v: DataValue, t: Timestamp, q: Quality) -> None:
+        self.V = v
+        self.T = t
+        self.Q = q
+
+    @staticmethod
+    def Make(v: DataValue, t: Timestamp, q: Quality) -> 'VTQ':
+        return VTQ(v, t, q)
+
+    def WithValue(self, v: DataValue) -> 'VTQ':
+        return VTQ(v, self.T, self.Q)
+
+
+class VariableRef:
+
+    def __init__(self, obj: str, name: str = "Value") -> None:
+        self.Object = obj
+        self.Name = name
+
+
+class _GenericList(list):
+
+    def Add(self, item) -> None:
+        self.append(item)
+
+    @property
+    def Count(self) -> int:
+        return len(self)
+
+
+class _GenericType:
+    """Mimics pythonnet generic type syntax List[T]() and Array[T](items)"""
+
+    def __getitem__(self, _typeArgs):
+        return _GenericList
+
+
+List = _GenericType()
+Array = _GenericType()
+
+
+def MakeHistory(count: int, startTicks: int = 1_700_000_000_000, stepMillis: int = 60_000) -> _GenericList:
+    """Creates a List<VTQ> like the host returns for historian queries"""
+    result = _GenericList()
+    for i in range(count):
+        result.append(VTQ(DataValue(repr(float(i))), Timestamp(startTicks + i * stepMillis), Quality.Good))
+    return result
+
+
+_historyCache: dict[int, _GenericList] = {}
+
+def _cachedHistory(count: int) -> _GenericList:
+    # The host returns a fresh .NET list each call, but creating the stand-in VTQs
+    # would dominate the measurement of the Python wrappers
+    history = _historyCache.get(count)
+    if history is None:
+        history = MakeHistory(count)
+        _historyCache[count] = history
+    return history
+
+
+class PyAggregatedIntervals:
+
+    _units = {"ms": 1, "s": 1000, "min": 60_000, "h": 3_600_000, "d": 86_400_000}
+    _cache: dict = {}
+
+    def __init__(self, start: Timestamp, end: Timestamp, resolution: str, aggregations) -> None:
+        # Only fixed resolutions, calendar units are handled by the .NET implementation
+        count, unit = resolution.split()
+        step = int(count) * self._units[unit]
+        key = (start.JavaTicks, end.JavaTicks, step, len(aggregations))
+        cached = self._cache.get(key)
+        if cached is None:
+            starts = array.array("q", range(start.JavaTicks, end.JavaTicks, step))
+            values = [array.array("d", map(float, range(len(starts)))) for _ in aggregations]
+            cached = (starts, values)
+            self._cache[key] = cached
+        self._starts, self._values = cached
+
+    @property
+    def Count(self) -> int:
+        return len(self._starts)
+
+    @property
+    def AggregationCount(self) -> int:
+        return len(self._values)
+
+    def CopyIntervalStartsTo(self, buffer) -> None:
+        memoryview(buffer).cast("B")[:] = memoryview(self._starts).cast("B")
+
+    def CopyValuesTo(self, aggregationIndex: int, buffer) -> None:
+        memoryview(buffer).cast("B")[:] = memoryview(self._values[aggregationIndex]).cast("B")
+
+
+class Identifiable:
+
+    def __init__(self, name: str, unit: str) -> None:
+        self.ID = name
+        self.Name = name
+        self.Unit = unit
+
+
+class PyInputBase(Identifiable):
+
+    HistorySize = 1000
+
+    def __init__(self, name: str, unit: str, type: DataType, dimension: int, defaultValue: DataValue) -> None:
+        super().__init__(name, unit)
+        self.Type = type
+        self.Dimension = dimension
+        self.VTQ = VTQ(defaultValue, Timestamp(0), Quality.Good)
+        self.AttachedVariable = None
+
+    def SetDefaultVariable(self, variable: VariableRef) -> None:
+        self.AttachedVariable = variable
+
+    def GetTimestamp(self) -> float:
+        return self.VTQ.T.JavaTicks / 1000.0
+
+    def HistorianReadRaw(self, startInclusive, endInclusive, maxValues, bounding, filter):
+        return _cachedHistory(min(maxValues, self.HistorySize))
+
+    def HistorianCount(self, startInclusive, endInclusive, filter) -> int:
+        return self.HistorySize
+
+    def HistorianReadAggregatedIntervals(self, intervalBounds, aggregation, rawFilter):
+        return _cachedHistory(max(len(intervalBounds) - 1, 0))
+
+    def HistorianReadAggregatedInterval(self, startInclusive, endInclusive, aggregation, rawFilter) -> Optional[float]:
+        return 0.0
+
+    def HistorianReadAggregatedRange(self, startInclusive, endExclusive, resolution, aggregations, rawFilter):
+        return PyAggregatedIntervals(startInclusive, endExclusive, resolution, aggregations)
+
+
+class PyOutputBase(Identifiable):
+
+    def __init__(self, name: str, unit: str, type: DataType, dimension: int) -> None:
+        super().__init__(name, unit)
+        self.Type = type
+        self.Dimension = dimension
+        self.VTQ = VTQ(DataValue.Empty, Timestamp(0), Quality.Good)
+        self._pendingTimes: Optional[array.array] = None
+        self._pendingValues: Optional[array.array] = None
+
+    def SetTime(self, secondsSinceEpoch: float) -> None:
+        self.VTQ = VTQ(self.VTQ.V, Timestamp(round(secondsSinceEpoch * 1000)), self.VTQ.Q)
+
+    def SetValue(self, value: DataValue) -> None:
+        self.VTQ = self.VTQ.WithValue(value)
+
+    def SetFloat64ArrayFromBuffer(self, values, count: int) -> None:
+        buffer = array.array("d")
+        buffer.frombytes(memoryview(values).cast("B"))
+        self.VTQ = self.VTQ.WithValue(DataValue(None))
+
+    def BeginTimeseries(self, totalCount: int, append: bool, dropBefore: int) -> None:
+        self._pendingTimes = array.array("q")
+        self._pendingValues = array.array("d")
+
+    def AppendTimeseriesChunk(self, times, values, count: int) -> None:
+        self._pendingTimes.frombytes(memoryview(times).cast("B"))
+        self._pendingValues.frombytes(memoryview(values).cast("B"))
+
+    def EndTimeseries(self) -> None:
+        # Building the JSON happens on the .NET side and is not part of the Python cost
+        self._pendingTimes = None
+        self._pendingValues = None
+        self.VTQ = self.VTQ.WithValue(DataValue(None))
+
+
+class PyStateBase(Identifiable):
+
+    def __init__(self, name: str, unit: str, type: DataType, dimension: int, defaultValue: DataValue) -> None:
+        super().__init__(name, unit)
+        self.theValue = defaultValue
+
+
+class PyLogger:
+
+    def Info(self, message: str) -> None:
+        pass
+
+    def Warn(self, message: str) -> None:
+        pass
+
+    def Error(self, message: str) -> None:
+        pass
+
+
+class PyApi:
+
+    HistorySize = 1000
+    AbortStep = False
+
+    def ReadVariablesHistory(self, variables, startTime, endTime, emptyResultOnError, filter):
+        result = _GenericList()
+        for _ in variables:
+            result.append(_cachedHistory(self.HistorySize))
+        return result
+
+    def ReadVariablesHistoryLastN(self, variables, n, emptyResultOnError):
+        result = _GenericList()
+        for _ in variables:
+            result.append(_cachedHistory(n))
+        return result
+
+    def HistorianReadAggregatedIntervals(self, variable, intervalBounds, aggregation, rawFilter):
+        return _cachedHistory(max(len(intervalBounds) - 1, 0))
+
+    def HistorianReadAggregatedInterval(self, variable, startInclusive, endInclusive, aggregation, rawFilter) -> Optional[float]:
+        return 0.0
+
+    def HistorianReadAggregatedRange(self, variable, startInclusive, endExclusive, resolution, aggregations, rawFilter):
+        return PyAggregatedIntervals(startInclusive, endExclusive, resolution, aggregations)
+
+    def GetVariableRefsBelow(self, objectIDs, types, varNames):
+        return _GenericList(VariableRef(obj) for obj in objectIDs)
+
+    @staticmethod
+    def MakeVariableRefs(inputs):
+        return _GenericList(inp.AttachedVariable or VariableRef(inp.ID) for inp in inputs)
+
+    @staticmethod
+    def MakeVariableRefsFromObjectIDs(objectIDs):
+        return _GenericList(VariableRef(obj) for obj in objectIDs)
+
+
+class TimeAlignedMatrix:
+
+    def __init__(self, rows: list) -> None:
+        self.Rows = rows
+
+
+class AggregationUtils:
+    """Pass-through: the aggregation itself runs in .NET, only the wrapper cost is of interest"""
+
+    @staticmethod
+    def Aggregate(listHistories, aggregation, resolution, skipEmptyIntervals):
+        return listHistories
+
+    @staticmethod
+    def ExportToMatrix(listHistories):
+        return TimeAlignedMatrix(listHistories)
+
+
+class Alarm:
+
+    def __init__(self, name: str) -> None:
+        self.Name = name
+
+
+class EventLog:
+
+    def __init__(self, messagePrefix: str = "") -> None:
+        self.MessagePrefix = messagePrefix
+
+
+class Level(enum.IntEnum):
+    Info = 0
+    Warn = 1
+    Alarm = 2
+
+
+def _module(name: str, **members) -> types.ModuleType:
+    module = sys.modules.get(name)
+    if module is None:
+        module = types.ModuleType(name)
+        sys.modules[name] = module
+        parentName, _, childName = name.rpartition(".")
+        if parentName:
+            setattr(_module(parentName), childName, module)
+    for key, value in members.items():
+        setattr(module, key, value)
+    return module
+
+
+def Install() -> None:
+    _module("Ifak.Fast.Mediator",
+            Quality=Quality, Duration=Duration, Timestamp=Timestamp, QualityFilter=QualityFilter,
+            Aggregation=Aggregation, BoundingMethod=BoundingMethod, DataValue=DataValue,
+            DataType=DataType, VTQ=VTQ, VariableRef=VariableRef)
+    _module("Ifak.Fast.Mediator.Calc", AggregationUtils=AggregationUtils, TimeAlignedMatrix=TimeAlignedMatrix)
+    _module("Ifak.Fast.Mediator.Calc.Adapter_Python",
+            PyInputBase=PyInputBase, PyOutputBase=PyOutputBase, PyStateBase=PyStateBase,
+            PyLogger=PyLogger, PyApi=PyApi)
+    _module("Ifak.Fast.Mediator.Calc.Adapter_CSharp", Alarm=Alarm, EventLog=EventLog, Level=Level)
+    _module("System", Array=Array)
+    _module("System.Collections.Generic", List=List)
+
+
+def LoadFastISO() -> types.ModuleType:
+    """Installs the stand-ins and imports ../FastISO.py as module 'FastISO'"""
+    Install()
+    adapterDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if adapterDir not in sys.path:
+        sys.path.append(adapterDir)
+    spec = importlib.util.spec_from_file_location("FastISO", os.path.join(adapterDir, "FastISO.py"))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["FastISO"] = module
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,50 @@
+﻿// Licensed to ifak e.V. under one or more agreements.
+// ifak e.V. licenses this file to you under the MIT license.
+// See the LICENSE file in the project root for more information.
+
+using System;
+using System.Runtime.InteropServices;
+using Python.Runtime;
+
+namespace Ifak.Fast.Mediator.Calc.Adapter_Python;
+
+/// <summary>
+/// Bulk transfer of int64/float64 data from and to Python objects supporting the
+/// buffer protocol (e.g. numpy.ndarray, array.array, memoryview) without per item conversion.
+/// </summary>
+internal static class BufferUtil
+{
+    public static long[] ReadInt64(PyObject obj, int count) {
+        using PyBuffer buffer = obj.GetBuffer(PyBUF.C_CONTIGUOUS);
+        CheckBufferSize(buffer, count);
+        var result = new long[count];
+        Marshal.Copy(buffer.Buffer, result, 0, count);
+        return result;
+    }
+
+    public static double[] ReadFloat64(PyObject obj, int count) {
+        using PyBuffer buffer = obj.GetBuffer(PyBUF.C_CONTIGUOUS);
+        CheckBufferSize(buffer, count);
+        var result = new double[count];
+        Marshal.Copy(buffer.Buffer, result, 0, count);
+        return result;
+    }
+
+    public static void WriteInt64(long[] values, PyObject obj) {
+        using PyBuffer buffer = obj.GetBuffer(PyBUF.C_CONTIGUOUS | PyBUF.WRITABLE);
+        CheckBufferSize(buffer, values.Length);
+        Marshal.Copy(values, 0, buffer.Buffer, values.Length);
+    }
+
+    public static void WriteFloat64(double[] values, PyObject obj) {
+        using PyBuffer buffer = obj.GetBuffer(PyBUF.C_CONTIGUOUS | PyBUF.WRITABLE);
+        CheckBufferSize(buffer, values.Length);
+        Marshal.Copy(values, 0, buffer.Buffer, values.Length);
+    }
+
+    private static void CheckBufferSize(PyBuffer buffer, int count) {
+        if (buffer.ItemSize != 8 || buffer.Length != 8L * count) {
+            throw new Exception($"Expected buffer with {count} items of 8 bytes but got {buffer.Length} bytes with item size {buffer.ItemSize}");
+        }
+    }
+}
@@ -3,9 +3,15 @@ from Ifak.Fast.Mediator.Calc.Adapter_CSharp import Alarm, EventLog, Level
 from Ifak.Fast.Mediator import Quality, Duration, Timestamp, QualityFilter, Aggregation, BoundingMethod
 import Ifak.Fast.Mediator
 import json
+import math
+import array
+import gc
+import os
+import sys
+import tracemalloc
 from System.Collections.Generic import List
 from System import Array
-from typing import Optional, Union
+from typing import Any, Callable, Optional, Union
 from datetime import datetime, timezone, timedelta
 
 
@@ -121,6 +127,104 @@ def _verifyOptionalListOfTimeseriesEntry(name: str, value: Optional[list[Timeser
             if not isinstance(value[i], TimeseriesEntry):
                 raise Exception(f"{name}[{i}] must be a TimeseriesEntry but is {type(value[i]).__name__}")
 
+def _numpyOrNone():
+    try:
+        import numpy
+        return numpy
+    except ImportError:
+        return None
+
+def _toFloat64Buffer(name: str, values, allowNone: bool):
+    """allowNone: None entries are converted to NaN, otherwise they are rejected"""
+    numpy = _numpyOrNone()
+    if numpy is not None and isinstance(values, numpy.ndarray):
+        if values.ndim != 1:
+            raise Exception(f"{name} must be one-dimensional but has {values.ndim} dimensions")
+        if not values.dtype.hasobject:
+            try:
+                return numpy.ascontiguousarray(values, dtype=numpy.float64)
+            except (TypeError, ValueError):
+                raise Exception(f"{name} must contain float values only but has dtype {values.dtype}")
+        values = values.tolist()  # object arrays are checked like lists
+    elif not isinstance(values, list):
+        values = list(values)
+    if not allowNone:
+        for i, v in enumerate(values):
+            if v is None:
+                raise Exception(f"{name}[{i}] must be a float or int but is NoneType")
+    try:
+        return array.array("d", [math.nan if v is None else v for v in values])
+    except TypeError:
+        raise Exception(f"{name} must contain float{' or None' if allowNone else ''} values only")
+
+def _toJavaTicksBuffer(name: str, times):
+    numpy = _numpyOrNone()
+    if numpy is not None and isinstance(times, numpy.ndarray):
+        if times.ndim != 1:
+            raise Exception(f"{name} must be one-dimensional but has {times.ndim} dimensions")
+        if numpy.issubdtype(times.dtype, numpy.datetime64):
+            return numpy.ascontiguousarray(times.astype("datetime64[ms]").astype(numpy.int64))
+        if numpy.issubdtype(times.dtype, numpy.integer):
+            return numpy.ascontiguousarray(times, dtype=numpy.int64)
+        raise Exception(f"{name} must have dtype datetime64 or int64 (milliseconds since epoch) but has {times.dtype}")
+    result = array.array("q")
+    for i, t in enumerate(times):
+        result.append(_toJavaTicks(f"{name}[{i}]", t))
+    return result
+
+def _toJavaTicks(name: str, t) -> int:
+    if isinstance(t, datetime):
+        if t.tzinfo is None:
+            t = t.replace(tzinfo=timezone.utc)  # naive datetimes are UTC, as in _datetime2str
+        return round(t.timestamp() * 1000)
+    if isinstance(t, Timestamp):
+        return t.JavaTicks
+    raise Exception(f"{name} must be a datetime or Timestamp but is {type(t).__name__}")
+
+_KEEP_ALL = -(2 ** 63)  # long.MinValue, i.e. no dropBefore cutoff
+
+def _sendTimeseriesColumns(output: PyOutputBase, times, values, append: bool, dropBefore, chunkSize: int) -> None:
+    if chunkSize < 1:
+        raise Exception(f"Output {output.ID}: chunkSize must be >= 1 but is {chunkSize}")
+    timesBuffer = _toJavaTicksBuffer(f"Output {output.ID}: times", times)
+    valuesBuffer = _toFloat64Buffer(f"Output {output.ID}: values", values, True)
+    count = len(timesBuffer)
+    if len(valuesBuffer) != count:
+        raise Exception(f"Output {output.ID}: times and values must have the same length ({count} != {len(valuesBuffer)})")
+    timesView = memoryview(timesBuffer)
+    valuesView = memoryview(valuesBuffer)
+    dropBeforeTicks = _KEEP_ALL if dropBefore is None else _toJavaTicks(f"Output {output.ID}: dropBefore", dropBefore)
+    output.BeginTimeseries(count, append, dropBeforeTicks)
+    for start in range(0, count, chunkSize):
+        end = min(start + chunkSize, count)
+        output.AppendTimeseriesChunk(timesView[start:end], valuesView[start:end], end - start)
+    output.EndTimeseries()
+
+def _resolutionToString(resolution: Union[str, timedelta, Duration]) -> str:
+    if isinstance(resolution, str):
+        return resolution
+    if isinstance(resolution, timedelta):
+        return f"{round(resolution.total_seconds() * 1000)} ms"
+    if isinstance(resolution, Duration):
+        return f"{resolution.TotalMilliseconds} ms"
+    raise Exception(f"resolution must be a str, timedelta or Duration but is {type(resolution).__name__}")
+
+def _aggregatedIntervalsToNumpy(result) -> tuple:
+    numpy = _numpyOrNone()
+    count = result.Count
+    times = numpy.empty(count, dtype=numpy.int64)
+    result.CopyIntervalStartsTo(times)
+    values = []
+    for i in range(result.AggregationCount):
+        v = numpy.empty(count, dtype=numpy.float64)
+        result.CopyValuesTo(i, v)
+        values.append(v)
+    return times.view("datetime64[ms]"), values
+
+def _requireNumpy(what: str) -> None:
+    if _numpyOrNone() is None:
+        raise Exception(f"{what} requires numpy")
+
 class Logger(PyLogger):
 
     def info(self, message: object) -> None:
@@ -163,6 +267,16 @@ class MyInputBase(PyInputBase):
         result = super().HistorianReadAggregatedInterval(startInclusive, endInclusive, aggregation, rawFilter)
         return result
 
+    def HistorianReadAggregatedRange(self, startInclusive: Timestamp, endExclusive: Timestamp, resolution: Union[str, timedelta, Duration], aggregations: list[Aggregation], rawFilter: QualityFilter = QualityFilter.ExcludeNone) -> tuple:
+        """Aggregates the intervals [startInclusive, startInclusive + resolution, ..., endExclusive] without creating
+        Timestamp or VTQ objects in Python. resolution is a fixed duration (e.g. "15 min", "1 h", timedelta) or a
+        calendar unit in local time ("1 day", "1 week", "1 month", "1 year").
+        Returns (interval starts as numpy datetime64[ms] array, [numpy float64 array per aggregation, NaN = no value])"""
+        _requireNumpy("HistorianReadAggregatedRange")
+        dotnet_aggregations = Array[Aggregation](aggregations)
+        result = super().HistorianReadAggregatedRange(startInclusive, endExclusive, _resolutionToString(resolution), dotnet_aggregations, rawFilter)
+        return _aggregatedIntervalsToNumpy(result)
+
 class InputFloat64(MyInputBase):
 
     def __init__(self, name: str, unit: str = "", defaultValue: Optional[float] = 0.0) -> None:
@@ -600,6 +714,12 @@ class OutputFloat64Array(MyOutputBase):
         newValue = Ifak.Fast.Mediator.DataValue.FromJSON(json.dumps(value))
         self.SetValue(newValue)
 
+    def SetValues(self, values) -> None:
+        """Bulk alternative to the Value setter for large arrays, e.g. numpy.ndarray.
+        Like the Value setter, None entries are rejected."""
+        buffer = _toFloat64Buffer(f"Output {self.ID}: values", values, False)
+        self.SetFloat64ArrayFromBuffer(memoryview(buffer), len(buffer))
+
 
 class OutputString(MyOutputBase):
 
@@ -658,6 +778,21 @@ class OutputTimeseries(MyOutputBase):
             newValue = Ifak.Fast.Mediator.DataValue.FromJSON(json.dumps(valueForJSON))
         self.SetValue(newValue)
 
+    def SetColumns(self, times, values, chunkSize: int = 65536) -> None:
+        """Bulk alternative to the Value setter for large float timeseries.
+        times: numpy datetime64 or int64 (milliseconds since epoch) array or list of datetime, strictly increasing
+        values: numpy float array or list of float (None or NaN for missing values)"""
+        _sendTimeseriesColumns(self, times, values, False, None, chunkSize)
+
+    def AppendColumns(self, times, values, dropBefore: Optional[Union[datetime, Timestamp]] = None, chunkSize: int = 65536) -> None:
+        """Like SetColumns, but only the new or changed points are given: they are merged into
+        the timeseries written by the latest SetColumns/AppendColumns call (e.g. in the previous step).
+        The merged timeseries is only kept in memory, so after (re)initialization of the calculation
+        SetColumns must be called first, otherwise AppendColumns raises an exception.
+        dropBefore: points older than this time are removed from the merged timeseries,
+        use it to keep the size of the output bounded (e.g. t - timedelta(days=7))."""
+        _sendTimeseriesColumns(self, times, values, True, dropBefore, chunkSize)
+
 
 class OutputObject(MyOutputBase):
 
@@ -715,6 +850,13 @@ class Api(Ifak.Fast.Mediator.Calc.Adapter_Python.PyApi):
         result = super().HistorianReadAggregatedInterval(variable, startInclusive, endInclusive, aggregation, rawFilter)
         return result
 
+    def HistorianReadAggregatedRange(self, variable: Ifak.Fast.Mediator.VariableRef, startInclusive: Timestamp, endExclusive: Timestamp, resolution: Union[str, timedelta, Duration], aggregations: list[Aggregation], rawFilter: QualityFilter = QualityFilter.ExcludeNone) -> tuple:
+        """See MyInputBase.HistorianReadAggregatedRange"""
+        _requireNumpy("HistorianReadAggregatedRange")
+        dotnet_aggregations = Array[Aggregation](aggregations)
+        result = super().HistorianReadAggregatedRange(variable, startInclusive, endExclusive, _resolutionToString(resolution), dotnet_aggregations, rawFilter)
+        return _aggregatedIntervalsToNumpy(result)
+
     @classmethod
     def MakeVariableRefs(cls, inputs: list[PyInputBase]) -> list[Ifak.Fast.Mediator.VariableRef]:
         dotnet_inputs = List[PyInputBase]()
@@ -768,3 +910,163 @@ class AggregationUtils(Ifak.Fast.Mediator.Calc.AggregationUtils):
             dotnet_listHistories.Add(dotnet_history)
         result = Ifak.Fast.Mediator.Calc.AggregationUtils.ExportToMatrix(dotnet_listHistories)
         return result
+
+
+def _pythonExecutable() -> str:
+    # Inside the host process sys.executable refers to the .NET executable, not to python
+    if os.name == "nt":
+        candidates = [os.path.join(sys.base_exec_prefix, "python.exe")]
+    else:
+        version = f"{sys.version_info.major}.{sys.version_info.minor}"
+        binDir = os.path.join(sys.base_exec_prefix, "bin")
+        candidates = [os.path.join(binDir, f"python{version}"), os.path.join(binDir, "python3")]
+    for candidate in candidates:
+        if os.path.isfile(candidate):
+            return candidate
+    raise Exception(f"ProcessPool: Python executable not found in {sys.base_exec_prefix}, use parameter pythonExecutable")
+
+
+class ProcessPool:
+    """Persistent pool of worker processes for CPU bound work inside step().
+    Create and Start the pool in initialize() and call Shutdown() in shutdown().
+    The function given to Map must be defined in a module importable by the workers
+    (e.g. located in python-library-directories), not in the calculation script itself.
+    NumPy arrays in items are transferred via shared memory, as are array results
+    except on Windows, where results are pickled."""
+
+    def __init__(self, workers: Optional[int] = None, pythonExecutable: Optional[str] = None) -> None:
+        self._workers: int = workers if workers is not None else (os.cpu_count() or 1)
+        if self._workers < 1:
+            raise Exception(f"ProcessPool: workers must be >= 1 but is {self._workers}")
+        self._pythonExecutable: Optional[str] = pythonExecutable
+        self._executor: Optional['concurrent.futures.ProcessPoolExecutor'] = None
+
+    @property
+    def Workers(self) -> int:
+        return self._workers
+
+    def Start(self) -> None:
+        if self._executor is not None:
+            return
+        # Imported here so that calculations not using ProcessPool do not pay for it:
+        import multiprocessing
+        import concurrent.futures
+        context = multiprocessing.get_context("spawn")
+        context.set_executable(self._pythonExecutable or _pythonExecutable())
+        self._executor = concurrent.futures.ProcessPoolExecutor(max_workers=self._workers, mp_context=context)
+        # Spawn all workers now instead of during the first step:
+        warmup = [self._executor.submit(os.getpid) for _ in range(self._workers)]
+        for future in warmup:
+            future.result()
+
+    def Map(self, func: Callable[[Any], Any], items: list) -> list:
+        """Returns [func(item) for item in items] computed by the worker processes.
+        The result order equals the order of items. If one item fails, the remaining work is cancelled."""
+        if self._executor is None:
+            raise Exception("ProcessPool: Start() must be called (in initialize) before Map")
+        import concurrent.futures
+        import FastParallel
+        inputBlocks: list = []
+        futures: list = []
+        try:
+            for item in items:
+                encodedItem = FastParallel.encode(item, inputBlocks)
+                futures.append(self._executor.submit(FastParallel.runTask, func, encodedItem))
+            done, _ = concurrent.futures.wait(futures, return_when=concurrent.futures.FIRST_EXCEPTION)
+            for future in done:
+                if future.exception() is not None:
+                    index = futures.index(future)
+                    exp = future.exception()
+                    raise Exception(f"ProcessPool.Map: item {index} failed: {type(exp).__name__}: {exp}") from exp
+            return [_decodeResult(future.result()) for future in futures]
+        except:
+            # Release shared memory of results that are no longer needed:
+            for future in futures:
+                if not future.cancel():
+                    future.add_done_callback(_discardResult)
+            raise
+        finally:
+            FastParallel.closeBlocks(inputBlocks, unlink=True)
+
+    def Shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+def _decodeResult(encodedResult: Any) -> Any:
+    import FastParallel
+    blocks: list = []
+    try:
+        return FastParallel.decode(encodedResult, blocks, copy=True)
+    finally:
+        FastParallel.closeBlocks(blocks, unlink=True)
+
+def _discardResult(future: 'concurrent.futures.Future') -> None:
+    if future.cancelled() or future.exception() is not None:
+        return
+    try:
+        _decodeResult(future.result())
+    except Exception:
+        pass
+
+
+########### Memory instrumentation #############
+
+
+def _countDotNetProxies() -> int:
+    clrMetatype = type(Timestamp)
+    if clrMetatype is type:
+        return 0  # not running inside pythonnet
+    proxies = set()
+    for obj in gc.get_objects():
+        if type(type(obj)) is clrMetatype:
+            proxies.add(id(obj))
+        elif isinstance(obj, (list, tuple, set)):
+            for x in obj:
+                if type(type(x)) is clrMetatype:
+                    proxies.add(id(x))
+        elif isinstance(obj, dict):
+            for x in obj.values():
+                if type(type(x)) is clrMetatype:
+                    proxies.add(id(x))
+    return len(proxies)
+
+
+class _MemoryMonitor:
+    """Created by the adapter if python-memory-instrumentation is enabled, Sample is called after every step"""
+
+    def __init__(self, topN: int) -> None:
+        self._topN = topN
+        self._lastTraced: Optional[int] = None
+        self._lastProxies: Optional[int] = None
+        self._lastSizes: dict = {}
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def Sample(self) -> tuple[int, int, int, int, str]:
+        """Returns (traced bytes, traced growth, .NET proxies, proxy growth, top growing source lines)"""
+        snapshot = tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+        sizes = {}
+        for stat in snapshot.statistics("lineno"):
+            frame = stat.traceback[0]
+            sizes[(frame.filename, frame.lineno)] = stat.size
+        snapshot = None
+        traced = sum(sizes.values())
+        proxies = _countDotNetProxies()
+
+        growth = []
+        if self._lastTraced is not None:
+            for key, size in sizes.items():
+                diff = size - self._lastSizes.get(key, 0)
+                if diff > 0:
+                    growth.append((diff, key))
+            growth.sort(reverse=True)
+        top = ", ".join(f"{filename}:{lineno} +{diff / 1024:.1f} KiB" for diff, (filename, lineno) in growth[:self._topN])
+
+        tracedGrowth = traced - self._lastTraced if self._lastTraced is not None else 0
+        proxyGrowth = proxies - self._lastProxies if self._lastProxies is not None else 0
+        self._lastTraced = traced
+        self._lastProxies = proxies
+        self._lastSizes = sizes
+        return (traced, tracedGrowth, proxies, proxyGrowth, top)
@@ -0,0 +1,107 @@
+"""Worker side of FastISO.ProcessPool.
+
+FastISO.py is loaded from a string inside the host process and therefore cannot be
+imported by spawned worker processes. Everything a worker needs to unpickle lives here
+and must not depend on pythonnet or the Mediator assemblies.
+"""
+
+import os
+from multiprocessing import shared_memory
+from typing import Any, Callable
+
+
+class SharedArray:
+    """Reference to a NumPy array that has been copied into a named shared memory block"""
+
+    def __init__(self, name: str, shape: tuple, dtype: str) -> None:
+        self.Name = name
+        self.Shape = shape
+        self.DType = dtype
+
+
+def _isSharableArray(value: Any) -> bool:
+    try:
+        import numpy
+    except ImportError:
+        return False
+    return isinstance(value, numpy.ndarray) and not value.dtype.hasobject
+
+
+def _arrayToShared(arr, blocks: list) -> SharedArray:
+    import numpy
+    shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+    blocks.append(shm)
+    view = numpy.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)
+    view[...] = arr
+    return SharedArray(shm.name, arr.shape, arr.dtype.str)
+
+
+def encode(value: Any, blocks: list) -> Any:
+    """Replace NumPy arrays (also inside tuple, list and dict) by SharedArray references.
+    Every created shared memory block is appended to blocks."""
+    if _isSharableArray(value):
+        return _arrayToShared(value, blocks)
+    if isinstance(value, tuple):
+        return tuple(encode(x, blocks) for x in value)
+    if isinstance(value, list):
+        return [encode(x, blocks) for x in value]
+    if isinstance(value, dict):
+        return {k: encode(v, blocks) for k, v in value.items()}
+    return value
+
+
+def decode(value: Any, blocks: list, copy: bool) -> Any:
+    """Resolve SharedArray references created by encode. With copy=False the returned
+    arrays are views on the shared memory and only valid while the blocks are open."""
+    if isinstance(value, SharedArray):
+        import numpy
+        shm = shared_memory.SharedMemory(name=value.Name)
+        blocks.append(shm)
+        view = numpy.ndarray(value.Shape, dtype=numpy.dtype(value.DType), buffer=shm.buf)
+        return view.copy() if copy else view
+    if isinstance(value, tuple):
+        return tuple(decode(x, blocks, copy) for x in value)
+    if isinstance(value, list):
+        return [decode(x, blocks, copy) for x in value]
+    if isinstance(value, dict):
+        return {k: decode(v, blocks, copy) for k, v in value.items()}
+    return value
+
+
+def closeBlocks(blocks: list, unlink: bool) -> None:
+    for shm in blocks:
+        try:
+            shm.close()
+        except Exception:
+            pass
+        if unlink:
+            try:
+                shm.unlink()
+            except Exception:
+                pass
+    blocks.clear()
+
+
+def runTask(func: Callable, encodedItem: Any) -> Any:
+    """Executed inside a worker process: resolves shared arrays, calls func and moves
+    array results into new shared memory blocks that are released by the caller."""
+    inputBlocks: list = []
+    try:
+        item = decode(encodedItem, inputBlocks, copy=False)
+        result = func(item)
+        if os.name == "nt":
+            # On Windows a named block is freed as soon as the last handle is closed, i.e. it
+            # would be gone before the caller can open it. Results are pickled instead.
+            return result
+        resultBlocks: list = []
+        try:
+            encodedResult = encode(result, resultBlocks)
+        except:
+            closeBlocks(resultBlocks, unlink=True)
+            raise
+        # The caller unlinks the result blocks after copying them out:
+        closeBlocks(resultBlocks, unlink=False)
+        return encodedResult
+    finally:
+        item = None
+        closeBlocks(inputBlocks, unlink=False)
@@ -3,7 +3,10 @@
 // See the LICENSE file in the project root for more information.
 
 using System;
+using System.Linq;
 using Ifak.Fast.Mediator.Calc.Adapter_CSharp;
+using Python.Runtime;
+using VTQs = System.Collections.Generic.List<Ifak.Fast.Mediator.VTQ>;
 
 namespace Ifak.Fast.Mediator.Calc.Adapter_Python;
 
@@ -17,6 +20,12 @@ public class PyInputBase : InputBase {
         // secondsSinceEpoch
         return Time.JavaTicks / 1000.0;
     }
+
+    public PyAggregatedIntervals HistorianReadAggregatedRange(Timestamp startInclusive, Timestamp endExclusive, string resolution, Aggregation[] aggregations, QualityFilter rawFilter = QualityFilter.ExcludeNone) {
+        Timestamp[] bounds = IntervalBounds.Make(startInclusive, endExclusive, resolution);
+        VTQs[] results = aggregations.Select(aggregation => HistorianReadAggregatedIntervals(bounds, aggregation, rawFilter)).ToArray();
+        return new PyAggregatedIntervals(bounds, results);
+    }
 }
 
 public class PyOutputBase : OutputBase {
@@ -33,6 +42,91 @@ public class PyOutputBase : OutputBase {
 
     public void SetValue(DataValue value) {
         VTQ = VTQ.WithValue(value);
+        timeseriesTimes = null;
+        timeseriesValues = null;
+    }
+
+    // values: C-contiguous buffer (e.g. numpy.ndarray, array.array) of count float64 items
+    public void SetFloat64ArrayFromBuffer(PyObject values, int count) {
+        double[] array = BufferUtil.ReadFloat64(values, count);
+        VTQ = VTQ.WithValue(DataValue.FromDoubleArray(array));
+    }
+
+    // Timeseries sent by the latest EndTimeseries call (JavaTicks and values, NaN = null).
+    // Only kept in memory of the adapter process, i.e. null after (re)initialization:
+    private long[]? timeseriesTimes = null;
+    private double[]? timeseriesValues = null;
+
+    private long[]? pendingTimes = null;
+    private double[]? pendingValues = null;
+    private int pendingCount = 0;
+    private bool pendingAppend = false;
+    private long pendingDropBefore = long.MinValue;
+
+    // append: merge into the timeseries of the latest EndTimeseries call, which must exist
+    // dropBefore: entries with time < dropBefore (JavaTicks) are removed from the result, long.MinValue = keep all
+    public void BeginTimeseries(int totalCount, bool append, long dropBefore) {
+        if (totalCount < 0) throw new Exception($"Output {ID}: totalCount must be >= 0 but is {totalCount}");
+        if (append && timeseriesTimes == null) {
+            throw new Exception($"Output {ID}: AppendColumns requires a preceding SetColumns after initialization (no base timeseries available)");
+        }
+        pendingTimes = new long[totalCount];
+        pendingValues = new double[totalCount];
+        pendingCount = 0;
+        pendingAppend = append;
+        pendingDropBefore = dropBefore;
+    }
+
+    // times: C-contiguous buffer of count int64 items (JavaTicks, strictly increasing)
+    // values: C-contiguous buffer of count float64 items (NaN = null)
+    public void AppendTimeseriesChunk(PyObject times, PyObject values, int count) {
+
+        long[] allTimes = pendingTimes ?? throw new Exception($"Output {ID}: BeginTimeseries not called");
+        double[] allValues = pendingValues!;
+
+        if (pendingCount + count > allTimes.Length) {
+            throw new Exception($"Output {ID}: more timeseries entries than announced ({allTimes.Length})");
+        }
+
+        long[] chunkTimes = BufferUtil.ReadInt64(times, count);
+        double[] chunkValues = BufferUtil.ReadFloat64(values, count);
+
+        long prev = pendingCount > 0 ? allTimes[pendingCount - 1] : long.MinValue;
+        for (int i = 0; i < count; ++i) {
+            long t = chunkTimes[i];
+            if (t <= prev) {
+                throw new Exception($"Output {ID}: timestamps must be strictly increasing (entry {pendingCount + i})");
+            }
+            prev = t;
+        }
+
+        Array.Copy(chunkTimes, 0, allTimes, pendingCount, count);
+        Array.Copy(chunkValues, 0, allValues, pendingCount, count);
+        pendingCount += count;
+    }
+
+    public void EndTimeseries() {
+
+        long[] times = pendingTimes ?? throw new Exception($"Output {ID}: BeginTimeseries not called");
+        double[] values = pendingValues!;
+        pendingTimes = null;
+        pendingValues = null;
+
+        if (pendingCount != times.Length) {
+            throw new Exception($"Output {ID}: expected {times.Length} timeseries entries but got {pendingCount}");
+        }
+
+        if (pendingAppend) {
+            (times, values) = TimeseriesColumns.Merge(timeseriesTimes!, timeseriesValues!, times, values);
+        }
+
+        if (pendingDropBefore != long.MinValue) {
+            (times, values) = TimeseriesColumns.DropBefore(times, values, pendingDropBefore);
+        }
+
+        VTQ = VTQ.WithValue(TimeseriesColumns.ToDataValue(times, values));
+        timeseriesTimes = times;
+        timeseriesValues = values;
     }
 }
 
@@ -69,6 +163,13 @@ public class PyStateBase : AbstractState {
     }
 }
 
-public class PyApi : Api { }
+public class PyApi : Api {
+
+    public PyAggregatedIntervals HistorianReadAggregatedRange(VariableRef variable, Timestamp startInclusive, Timestamp endExclusive, string resolution, Aggregation[] aggregations, QualityFilter rawFilter = QualityFilter.ExcludeNone) {
+        Timestamp[] bounds = IntervalBounds.Make(startInclusive, endExclusive, resolution);
+        VTQs[] results = aggregations.Select(aggregation => HistorianReadAggregatedIntervals(variable, bounds, aggregation, rawFilter)).ToArray();
+        return new PyAggregatedIntervals(bounds, results);
+    }
+}
 
 public class PyLogger : Logger {}
@@ -0,0 +1,122 @@
+﻿// Licensed to ifak e.V. under one or more agreements.
+// ifak e.V. licenses this file to you under the MIT license.
+// See the LICENSE file in the project root for more information.
+
+using System;
+using System.Collections.Generic;
+using System.Linq;
+
+namespace Ifak.Fast.Mediator.Calc.Adapter_Python;
+
+/// <summary>
+/// Interval bounds for HistorianReadAggregatedRange, see PyInputBase.
+/// </summary>
+internal static class IntervalBounds
+{
+    private const int MaxIntervals = 10_000_000;
+
+    private enum CalendarUnit { Day, Week, Month, Year }
+
+    /// <summary>
+    /// Returns the interval bounds [start, start + resolution, ..., end]. The last interval
+    /// ends at end and may therefore be shorter than resolution.
+    /// resolution is either a fixed Duration (e.g. "15 min", "1 h") or a calendar unit in the
+    /// time zone of the application (e.g. "1 day", "1 week", "1 month", "3 months", "1 year").
+    /// </summary>
+    public static Timestamp[] Make(Timestamp start, Timestamp end, string resolution) {
+
+        if (end <= start) throw new Exception($"end ({end}) must be after start ({start})");
+
+        Func<long, Timestamp> boundAt = MakeBoundFunction(start, resolution);
+
+        var bounds = new List<Timestamp>();
+        for (long i = 0; ; ++i) {
+            Timestamp t = boundAt(i);
+            if (t >= end) break;
+            if (bounds.Count >= MaxIntervals) {
+                throw new Exception($"Resolution {resolution} results in more than {MaxIntervals} intervals");
+            }
+            bounds.Add(t);
+        }
+        bounds.Add(end);
+        return bounds.ToArray();
+    }
+
+    private static Func<long, Timestamp> MakeBoundFunction(Timestamp start, string resolution) {
+
+        if (TryParseCalendarUnit(resolution, out int count, out CalendarUnit unit)) {
+
+            TimeZoneInfo zone = AppTimeZone.TimeZone;
+            DateTime localStart = DateTime.SpecifyKind(AppTimeZone.ConvertToLocalTime(start), DateTimeKind.Unspecified);
+            TimeSpan startOffset = zone.GetUtcOffset(start.ToDateTime());
+
+            // Always step from localStart to avoid drift caused by month lengths (e.g. Jan 31 + 1 month).
+            // The first bound is start itself, converting localStart back may be ambiguous:
+            return i => {
+                if (i == 0) return start;
+                int k = checked((int)(i * count));
+                DateTime local = unit switch {
+                    CalendarUnit.Day   => localStart.AddDays(k),
+                    CalendarUnit.Week  => localStart.AddDays(7 * k),
+                    CalendarUnit.Month => localStart.AddMonths(k),
+                    CalendarUnit.Year  => localStart.AddYears(k),
+                    _ => throw new Exception($"Unknown calendar unit {unit}")
+                };
+                return LocalToTimestamp(local, zone, startOffset);
+            };
+        }
+
+        if (!Duration.TryParse(resolution, out Duration duration)) {
+            throw new Exception($"Invalid resolution '{resolution}'");
+        }
+
+        long millis = duration.TotalMilliseconds;
+        if (millis <= 0) throw new Exception($"Resolution must be positive but is {resolution}");
+
+        return i => Timestamp.FromJavaTicks(start.JavaTicks + i * millis);
+    }
+
+    private static Timestamp LocalToTimestamp(DateTime local, TimeZoneInfo zone, TimeSpan preferredOffset) {
+        // Local times skipped by a daylight saving transition are moved to the first valid time:
+        while (zone.IsInvalidTime(local)) {
+            local = local.AddMinutes(15);
+        }
+        // Local times repeated at the end of daylight saving time: use the offset of start if possible,
+        // otherwise the first occurrence (ConvertTimeToUtc would always pick standard time):
+        if (zone.IsAmbiguousTime(local)) {
+            TimeSpan[] offsets = zone.GetAmbiguousTimeOffsets(local);
+            TimeSpan offset = offsets.Contains(preferredOffset) ? preferredOffset : offsets.Max();
+            return Timestamp.FromDateTime(new DateTimeOffset(local, offset).UtcDateTime);
+        }
+        return Timestamp.FromDateTime(TimeZoneInfo.ConvertTimeToUtc(local, zone));
+    }
+
+    private static bool TryParseCalendarUnit(string resolution, out int count, out CalendarUnit unit) {
+
+        count = 1;
+        unit = CalendarUnit.Day;
+
+        string s = resolution.Trim().ToLowerInvariant();
+        int i = 0;
+        while (i < s.Length && char.IsDigit(s[i])) {
+            i += 1;
+        }
+
+        string strUnit = s.Substring(i).Trim();
+        CalendarUnit? u = strUnit switch {
+            "day"   or "days"   => CalendarUnit.Day,
+            "week"  or "weeks"  => CalendarUnit.Week,
+            "month" or "months" => CalendarUnit.Month,
+            "year"  or "years"  => CalendarUnit.Year,
+            _ => null
+        };
+        if (u == null) return false;
+
+        if (i > 0 && (!int.TryParse(s.Substring(0, i), out count) || count <= 0)) {
+            throw new Exception($"Invalid resolution '{resolution}'");
+        }
+
+        unit = u.Value;
+        return true;
+    }
+}
@@ -30,6 +30,16 @@ public class PythonExternal : CalculationBase, EventSink, ConnectionConsumer {
     private PyModule? moduleOuter = null;
     private PyModule? module = null;
 
+    private PyObject? memoryMonitor = null;
+    private double memoryBudgetMB = 0;
+    private double memoryGrowthThresholdKB = 100;
+    private int memoryProxyGrowthThreshold = 100;
+    private int memoryGrowthSteps = 0;
+    private bool memoryBudgetExceeded = false;
+    private bool memoryGrowthReported = false;
+    private const int MemoryGrowthStepsForWarning = 10;
+    private const int MemoryTopGrowthLines = 5; // source lines with largest growth included in the log output
+
     public override async Task<InitResult> Initialize(InitParameter parameter, AdapterCallback callback) {
 
         this.callback = callback;
@@ -69,12 +79,19 @@ public class PythonExternal : CalculationBase, EventSink, ConnectionConsumer {
 
         await Task.CompletedTask;
 
+        // The adapter runs in its own process, calendar based resolutions need the time zone of the application:
+        AppTimeZone.Initialize(parameter.ModuleInitInfo.TimeZoneId);
+
         var config = new Mediator.Config(parameter.ModuleConfig);
         string pythonDLL        = config.GetString("python-dll");
         string libDirs          = config.GetOptionalString("python-library-directories", "");
         string appendPath       = config.GetOptionalString("python-append-PATH", "");
         string appendPythonPath = config.GetOptionalString("python-append-PYTHONPATH", "");
         string pythonHome       = config.GetOptionalString("python-set-PYTHONHOME", "");
+        bool memoryInstrumentation = config.GetOptionalBool("python-memory-instrumentation", false);
+        memoryBudgetMB             = config.GetOptionalDouble("python-memory-budget-MB", 0);
+        memoryGrowthThresholdKB    = config.GetOptionalDouble("python-memory-growth-threshold-KB", 100);
+        memoryProxyGrowthThreshold = config.GetOptionalInt("python-memory-proxy-growth-threshold", 100);
 
         if (string.IsNullOrWhiteSpace(pythonDLL)) {
             throw new Exception("python-dll not configured");
@@ -132,7 +149,8 @@ public class PythonExternal : CalculationBase, EventSink, ConnectionConsumer {
         }
 
         string baseDir = AppDomain.CurrentDomain.BaseDirectory;
-        string filePath = Path.Combine(baseDir, "Adapter_Python/FastISO.py");
+        string adapterDir = Path.GetFullPath(Path.Combine(baseDir, "Adapter_Python"));
+        string filePath = Path.Combine(adapterDir, "FastISO.py");
         string header = File.ReadAllText(filePath, Encoding.UTF8);
 
         using (Py.GIL()) {
@@ -146,18 +164,25 @@ public class PythonExternal : CalculationBase, EventSink, ConnectionConsumer {
                 Console.Error.WriteLine("Failed to reconfigure Python stdout for line_buffereing");
             }
 
-            if (absoluteLibDirs.Length > 0) {
-                dynamic sys = Py.Import("sys");
-                PyObject pyObj = sys.path;
-                var sysPath = pyObj.As<string[]>().ToHashSet();
-                foreach (string dir in absoluteLibDirs) {
-                    if (!sysPath.Contains(dir)) {
-                        sys.path.append(dir);
-                    }
+            // adapterDir contains helper modules imported by FastISO.py (e.g. FastParallel.py)
+            string[] importDirs = [adapterDir, .. absoluteLibDirs];
+            dynamic sysModule = Py.Import("sys");
+            PyObject pySysPath = sysModule.path;
+            var sysPath = pySysPath.As<string[]>().ToHashSet();
+            foreach (string dir in importDirs) {
+                if (!sysPath.Contains(dir)) {
+                    sysModule.path.append(dir);
                 }
             }
 
             moduleOuter = PyModule.FromString(name: "fastimports", code: header);
+
+            if (memoryInstrumentation) {
+                // Start tracing before the script is executed to include script level allocations
+                PyObject monitorClass = GetAttrOrNull(moduleOuter, "_MemoryMonitor") ?? throw new Exception("Helper class _MemoryMonitor not found");
+                memoryMonitor = monitorClass.Invoke(MemoryTopGrowthLines.ToPython());
+            }
+
             module = moduleOuter.NewScope();
             module.Exec(code);
 
@@ -344,6 +369,17 @@ public class PythonExternal : CalculationBase, EventSink, ConnectionConsumer {
 
         stepAction(t, dt);
 
+        if (memoryMonitor != null) {
+            try {
+                SampleMemory();
+            }
+            catch (Exception exp) {
+                // Instrumentation must never fail the step itself:
+                memoryMonitor = null;
+                callback?.Notify_LogOutput($"Memory instrumentation failed and is disabled: {exp.Message}", LogLevel.Warning);
+            }
+        }
+
         StateValue[] resStates = states.Select(kv => new StateValue() {
             StateID = kv.ID,
             Value = kv.GetValue()
@@ -367,6 +403,57 @@ public class PythonExternal : CalculationBase, EventSink, ConnectionConsumer {
         return Task.FromResult(stepRes);
     }
 
+    private void SampleMemory() {
+
+        long traced, tracedGrowth, proxies, proxyGrowth;
+        string topGrowth;
+
+        using (Py.GIL()) {
+            using PyObject res = memoryMonitor!.InvokeMethod("Sample");
+            traced       = res[0].As<long>();
+            tracedGrowth = res[1].As<long>();
+            proxies      = res[2].As<long>();
+            proxyGrowth  = res[3].As<long>();
+            topGrowth    = res[4].As<string>();
+        }
+
+        const double MB = 1024 * 1024;
+        double rssMB = Environment.WorkingSet / MB;
+        string summary = $"RSS {rssMB:F1} MB, Python traced {traced / MB:F1} MB ({tracedGrowth / 1024.0:+0.0;-0.0} KB), .NET proxies {proxies} ({proxyGrowth:+0;-0})";
+
+        // Zero growth never counts, so that a threshold of 0 means "any growth":
+        bool growing = tracedGrowth > 0 && tracedGrowth >= memoryGrowthThresholdKB * 1024;
+        bool proxiesGrowing = proxyGrowth > 0 && proxyGrowth >= memoryProxyGrowthThreshold;
+        if (growing || proxiesGrowing) {
+            string top = string.IsNullOrEmpty(topGrowth) ? "" : $"; largest growth: {topGrowth}";
+            callback?.Notify_LogOutput($"Memory: {summary}{top}", LogLevel.Info);
+        }
+
+        memoryGrowthSteps = growing ? memoryGrowthSteps + 1 : 0;
+        if (memoryGrowthSteps >= MemoryGrowthStepsForWarning && !memoryGrowthReported) {
+            memoryGrowthReported = true;
+            string msg = $"Python memory grew in {memoryGrowthSteps} consecutive steps: {summary}";
+            callback?.Notify_AlarmOrEvent(AdapterAlarmOrEvent.Warning("MemoryGrowth", msg));
+        }
+        else if (memoryGrowthSteps == 0) {
+            memoryGrowthReported = false;
+        }
+
+        if (memoryBudgetMB > 0) {
+            bool exceeded = rssMB > memoryBudgetMB;
+            if (exceeded && !memoryBudgetExceeded) {
+                string msg = $"Memory budget of {memoryBudgetMB} MB exceeded: {summary}";
+                callback?.Notify_LogOutput(msg, LogLevel.Warning);
+                callback?.Notify_AlarmOrEvent(AdapterAlarmOrEvent.Warning("MemoryBudget", msg));
+            }
+            else if (!exceeded && memoryBudgetExceeded) {
+                string msg = $"Memory back within budget of {memoryBudgetMB} MB: {summary}";
+                callback?.Notify_AlarmOrEvent(AdapterAlarmOrEvent.ReturnToNormalEvent("MemoryBudget", msg));
+            }
+            memoryBudgetExceeded = exceeded;
+        }
+    }
+
     record MemberInfo(string Name, PyObject Value) {
 
         public bool TryConvertTo<T>(out T? result) where T : class {
@@ -0,0 +1,80 @@
+﻿// Licensed to ifak e.V. under one or more agreements.
+// ifak e.V. licenses this file to you under the MIT license.
+// See the LICENSE file in the project root for more information.
+
+using System;
+using System.Text;
+
+namespace Ifak.Fast.Mediator.Calc.Adapter_Python;
+
+/// <summary>
+/// Operations on timeseries given as columns (times in JavaTicks, strictly increasing,
+/// and values with NaN = null) used by the bulk write path of PyOutputBase.
+/// </summary>
+internal static class TimeseriesColumns
+{
+    /// <summary>
+    /// Merges b into a, both sorted by time. Entries of b replace entries of a with the same timestamp.
+    /// </summary>
+    public static (long[] Times, double[] Values) Merge(long[] aTimes, double[] aValues, long[] bTimes, double[] bValues) {
+
+        if (aTimes.Length == 0) return (bTimes, bValues);
+        if (bTimes.Length == 0) return (aTimes, aValues);
+
+        var times = new long[aTimes.Length + bTimes.Length];
+        var values = new double[times.Length];
+        int i = 0, j = 0, n = 0;
+
+        while (i < aTimes.Length || j < bTimes.Length) {
+            if (j == bTimes.Length || (i < aTimes.Length && aTimes[i] < bTimes[j])) {
+                times[n] = aTimes[i];
+                values[n] = aValues[i];
+                i += 1;
+            }
+            else {
+                if (i < aTimes.Length && aTimes[i] == bTimes[j]) {
+                    i += 1;
+                }
+                times[n] = bTimes[j];
+                values[n] = bValues[j];
+                j += 1;
+            }
+            n += 1;
+        }
+
+        if (n < times.Length) {
+            Array.Resize(ref times, n);
+            Array.Resize(ref values, n);
+        }
+        return (times, values);
+    }
+
+    /// <summary>
+    /// Removes all entries with time &lt; dropBefore, an entry exactly at dropBefore is kept.
+    /// </summary>
+    public static (long[] Times, double[] Values) DropBefore(long[] times, double[] values, long dropBefore) {
+        int idx = Array.BinarySearch(times, dropBefore);
+        int start = idx >= 0 ? idx : ~idx;
+        if (start == 0) return (times, values);
+        return (times[start..], values[start..]);
+    }
+
+    /// <summary>
+    /// Returns the timeseries as DataValue of TimeseriesEntry[] (same format as OutputTimeseries.Value in FastISO.py).
+    /// </summary>
+    public static DataValue ToDataValue(long[] times, double[] values) {
+        var sb = new StringBuilder(times.Length * 48 + 2);
+        sb.Append('[');
+        for (int i = 0; i < times.Length; ++i) {
+            if (i > 0) sb.Append(',');
+            sb.Append("{\"Time\":\"");
+            sb.Append(Timestamp.FromJavaTicks(times[i]).ToString());
+            sb.Append("\",\"Value\":");
+            double v = values[i];
+            sb.Append(double.IsNaN(v) ? "null" : StdJson.ValueToString(v));
+            sb.Append('}');
+        }
+        sb.Append(']');
+        return DataValue.FromJSON(sb.ToString());
+    }
+}
@@ -0,0 +1,113 @@
+﻿using System;
+using System.Linq;
+using Ifak.Fast.Mediator;
+using Ifak.Fast.Mediator.Calc.Adapter_Python;
+using Xunit;
+
+namespace Module_Calc_Test.Adapter_Python
+{
+    public class Test_IntervalBounds
+    {
+        public Test_IntervalBounds() {
+            // DST starts 2024-03-31 02:00 (to 03:00), ends 2024-10-27 03:00 (to 02:00)
+            AppTimeZone.Initialize("Europe/Berlin");
+        }
+
+        private static Timestamp T(string isoUtc) => Timestamp.FromISO8601(isoUtc);
+
+        private static void AssertBounds(Timestamp[] actual, params string[] expectedIsoUtc) {
+            Assert.Equal(expectedIsoUtc.Select(T).ToArray(), actual);
+        }
+
+        [Fact]
+        public void FixedResolution_LastIntervalEndsAtEnd() {
+            Timestamp[] bounds = IntervalBounds.Make(T("2024-01-01T00:00:00Z"), T("2024-01-01T00:50:00Z"), "15 min");
+            AssertBounds(bounds,
+                "2024-01-01T00:00:00Z",
+                "2024-01-01T00:15:00Z",
+                "2024-01-01T00:30:00Z",
+                "2024-01-01T00:45:00Z",
+                "2024-01-01T00:50:00Z");
+        }
+
+        [Fact]
+        public void Days_AcrossSpringForward() {
+            // Local midnights, 2024-03-31 has only 23 hours:
+            Timestamp[] bounds = IntervalBounds.Make(T("2024-03-29T23:00:00Z"), T("2024-04-01T22:00:00Z"), "1 day");
+            AssertBounds(bounds,
+                "2024-03-29T23:00:00Z",
+                "2024-03-30T23:00:00Z",
+                "2024-03-31T22:00:00Z",
+                "2024-04-01T22:00:00Z");
+        }
+
+        [Fact]
+        public void Days_SkippedLocalTimeMovesToFirstValidTime() {
+            // 2024-03-31 02:30 does not exist locally, the bound is 03:00 CEST:
+            Timestamp[] bounds = IntervalBounds.Make(T("2024-03-30T01:30:00Z"), T("2024-04-01T12:00:00Z"), "1 day");
+            AssertBounds(bounds,
+                "2024-03-30T01:30:00Z",
+                "2024-03-31T01:00:00Z",
+                "2024-04-01T00:30:00Z",
+                "2024-04-01T12:00:00Z");
+        }
+
+        [Fact]
+        public void Days_StartInRepeatedHourIsFirstBound() {
+            // 2024-10-27 02:30 CEST, i.e. the first occurrence of the repeated local time:
+            Timestamp start = T("2024-10-27T00:30:00Z");
+            Timestamp[] bounds = IntervalBounds.Make(start, T("2024-10-29T00:00:00Z"), "1 day");
+            AssertBounds(bounds,
+                "2024-10-27T00:30:00Z",
+                "2024-10-28T01:30:00Z",
+                "2024-10-29T00:00:00Z");
+        }
+
+        [Fact]
+        public void Months_RepeatedLocalTimeUsesOffsetOfStart() {
+
+            // Start in summer time (+02:00): first occurrence of 2024-10-27 02:30
+            Timestamp[] summer = IntervalBounds.Make(T("2024-09-27T00:30:00Z"), T("2024-11-01T00:00:00Z"), "1 month");
+            AssertBounds(summer,
+                "2024-09-27T00:30:00Z",
+                "2024-10-27T00:30:00Z",
+                "2024-11-01T00:00:00Z");
+
+            // Start in standard time (+01:00): second occurrence of 2024-10-27 02:30
+            Timestamp[] winter = IntervalBounds.Make(T("2024-01-27T01:30:00Z"), T("2024-11-01T00:00:00Z"), "1 month");
+            Assert.Equal(11, winter.Length);
+            Assert.Equal(T("2024-10-27T01:30:00Z"), winter[9]);
+        }
+
+        [Fact]
+        public void Months_StepFromStartWithoutDrift() {
+            // Local midnights of Jan 31, Feb 29, Mar 31, Apr 30 (CET until Mar 31 02:00, then CEST):
+            Timestamp[] bounds = IntervalBounds.Make(T("2024-01-30T23:00:00Z"), T("2024-05-01T00:00:00Z"), "1 month");
+            AssertBounds(bounds,
+                "2024-01-30T23:00:00Z",
+                "2024-02-28T23:00:00Z",
+                "2024-03-30T23:00:00Z",
+                "2024-04-29T22:00:00Z",
+                "2024-05-01T00:00:00Z");
+        }
+
+        [Fact]
+        public void Weeks_WithCount() {
+            Timestamp[] bounds = IntervalBounds.Make(T("2024-01-01T00:00:00Z"), T("2024-02-01T00:00:00Z"), "2 weeks");
+            AssertBounds(bounds,
+                "2024-01-01T00:00:00Z",
+                "2024-01-15T00:00:00Z",
+                "2024-01-29T00:00:00Z",
+                "2024-02-01T00:00:00Z");
+        }
+
+        [Fact]
+        public void InvalidArguments_Throw() {
+            Timestamp start = T("2024-01-01T00:00:00Z");
+            Timestamp end = T("2024-01-02T00:00:00Z");
+            Assert.Throws<Exception>(() => IntervalBounds.Make(start, end, "0 days"));
+            Assert.Throws<Exception>(() => IntervalBounds.Make(start, end, "fortnight"));
+            Assert.Throws<Exception>(() => IntervalBounds.Make(end, start, "1 day"));
+        }
+    }
+}
@@ -0,0 +1,82 @@
+﻿using Ifak.Fast.Mediator;
+using Ifak.Fast.Mediator.Calc.Adapter_Python;
+using Xunit;
+
+namespace Module_Calc_Test.Adapter_Python
+{
+    public class Test_TimeseriesColumns
+    {
+        [Fact]
+        public void Merge_ReplacesEqualTimestampsAndInterleaves() {
+
+            long[] aTimes = [10, 20, 30, 50];
+            double[] aValues = [1, 2, 3, 5];
+            long[] bTimes = [5, 20, 40, 50, 60];
+            double[] bValues = [0.5, 22, 44, double.NaN, 66];
+
+            var (times, values) = TimeseriesColumns.Merge(aTimes, aValues, bTimes, bValues);
+
+            Assert.Equal(new long[] { 5, 10, 20, 30, 40, 50, 60 }, times);
+            Assert.Equal(new double[] { 0.5, 1, 22, 3, 44, double.NaN, 66 }, values);
+        }
+
+        [Fact]
+        public void Merge_WithEmptySide() {
+
+            long[] times = [10, 20];
+            double[] values = [1, 2];
+
+            Assert.Equal(times, TimeseriesColumns.Merge([], [], times, values).Times);
+            Assert.Equal(values, TimeseriesColumns.Merge(times, values, [], []).Values);
+        }
+
+        [Fact]
+        public void DropBefore_KeepsEntryAtCutoff() {
+
+            long[] times = [10, 20, 30];
+            double[] values = [1, 2, 3];
+
+            Assert.Equal(new long[] { 20, 30 }, TimeseriesColumns.DropBefore(times, values, 20).Times);
+            Assert.Equal(new double[] { 2, 3 }, TimeseriesColumns.DropBefore(times, values, 20).Values);
+            Assert.Equal(new long[] { 30 }, TimeseriesColumns.DropBefore(times, values, 21).Times);
+            Assert.Equal(times, TimeseriesColumns.DropBefore(times, values, 10).Times);
+            Assert.Equal(times, TimeseriesColumns.DropBefore(times, values, long.MinValue).Times);
+            Assert.Empty(TimeseriesColumns.DropBefore(times, values, 31).Times);
+            Assert.Empty(TimeseriesColumns.DropBefore(times, values, 31).Values);
+        }
+
+        [Fact]
+        public void ToDataValue_NaNBecomesNull() {
+
+            long[] times = [1_704_067_200_000, 1_704_068_100_000];
+            double[] values = [1.5, double.NaN];
+
+            DataValue dv = TimeseriesColumns.ToDataValue(times, values);
+
+            Assert.DoesNotContain("NaN", dv.JSON);
+            TimeseriesEntry[] entries = dv.Object<TimeseriesEntry[]>()!;
+            Assert.Equal(2, entries.Length);
+            Assert.Equal(DataValue.FromDouble(1.5), entries[0].Value);
+            Assert.True(entries[1].Value.IsEmpty);
+        }
+
+        [Fact]
+        public void ToDataValue_MatchesOutputTimeseriesValue() {
+
+            long[] times = [1_704_067_200_000, 1_704_068_100_000, 1_704_069_000_123, 1_704_069_900_000];
+            double[] values = [1.5, double.NaN, 100.0, -2.5e-7];
+
+            // JSON written by OutputTimeseries.Value in FastISO.py (json.dumps of TimeseriesEntry.to_dict):
+            string jsonOfValuePath = "[" +
+                "{\"Time\": \"2024-01-01T00:00:00.000000Z\", \"Value\": 1.5}, " +
+                "{\"Time\": \"2024-01-01T00:15:00.000000Z\", \"Value\": null}, " +
+                "{\"Time\": \"2024-01-01T00:30:00.123000Z\", \"Value\": 100.0}, " +
+                "{\"Time\": \"2024-01-01T00:45:00.000000Z\", \"Value\": -2.5e-07}]";
+
+            TimeseriesEntry[] expected = DataValue.FromJSON(jsonOfValuePath).Object<TimeseriesEntry[]>()!;
+            TimeseriesEntry[] actual = TimeseriesColumns.ToDataValue(times, values).Object<TimeseriesEntry[]>()!;
+
+            Assert.Equal(expected, actual);
+        }
+    }
+}